@@ -402,9 +402,8 @@ class AbstractBackend(ABC):
 
         ...
 
-    @staticmethod
     @abstractmethod
-    def get_type_ref(wrapped_object):
+    def get_type_ref(self, wrapped_object):
         """ Return the reference to the type of a wrapped object. """
 
         ...
@@ -3,10 +3,11 @@
 # Copyright (c) 2026 Phil Thompson <phil@riverbankcomputing.com>
 
 
+from operator import attrgetter
+
 from ....scoped_name import STRIP_GLOBAL
 from ....specification import (AccessSpecifier, ArgumentType, IfaceFileType,
         MappedType, WrappedClass, WrappedEnum)
-from ....utils import find_method
 
 from ...formatters import fmt_argument_as_cpp_type
 
@@ -16,12 +17,12 @@ from ..snippets import (g_class_docstring, g_class_method_table,
         g_static_function)
 from ..utils import (get_class_flags, get_class_from_void, get_const_cast,
         get_docstring_text, get_encoded_type, get_enum_member,
-        get_function_table, get_mapped_type_flags, get_named_value_decl,
-        get_normalised_cached_name, get_optional_ptr, get_use_in_code,
-        get_user_state_suffix, get_void_ptr_cast, has_method_docstring,
-        is_used_in_code, keep_py_reference, need_dealloc, py_scope,
-        pyqt5_supported, pyqt6_supported, scoped_class_name,
-        scoped_variable_name, type_needs_user_state, variables_in_scope)
+        get_function_table, get_mapped_type_flags, get_members_with_docstrings,
+        get_named_value_decl, get_normalised_cached_name, get_optional_ptr,
+        get_use_in_code, get_user_state_suffix, get_void_ptr_cast,
+        has_method_docstring, is_used_in_code, keep_py_reference,
+        need_dealloc, py_scope, pyqt5_supported, pyqt6_supported,
+        scoped_class_name, scoped_variable_name, type_needs_user_state)
 
 from .abstract_backend import AbstractBackend
 
@@ -29,6 +30,62 @@ from .abstract_backend import AbstractBackend
 class v12v13Backend(AbstractBackend):
     """ The backend code generator for v12 and v13 of the ABI. """
 
+    # The types that are implemented as PyObject*.
+    _PY_OBJECT_TYPES = frozenset((ArgumentType.PYOBJECT, ArgumentType.PYTUPLE,
+        ArgumentType.PYLIST, ArgumentType.PYDICT, ArgumentType.PYCALLABLE,
+        ArgumentType.PYSLICE, ArgumentType.PYTYPE, ArgumentType.PYBUFFER,
+        ArgumentType.PYENUM))
+
+    # The types that are wrapped classes or mapped types.
+    _WRAPPED_TYPES = frozenset((ArgumentType.CLASS, ArgumentType.MAPPED))
+
+    # The types of 8-bit characters and strings.
+    _CHAR_STRING_TYPES = frozenset((ArgumentType.ASCII_STRING,
+        ArgumentType.LATIN1_STRING, ArgumentType.UTF8_STRING,
+        ArgumentType.SSTRING, ArgumentType.USTRING, ArgumentType.STRING))
+
+    # The bool and floating point types.
+    _BOOL_TYPES = frozenset((ArgumentType.BOOL, ArgumentType.CBOOL))
+    _FLOAT_TYPES = frozenset((ArgumentType.FLOAT, ArgumentType.CFLOAT))
+    _DOUBLE_TYPES = frozenset((ArgumentType.DOUBLE, ArgumentType.CDOUBLE))
+    _FLOATING_POINT_TYPES = _FLOAT_TYPES | _DOUBLE_TYPES
+
+    # The types that are added to a dictionary as an int.
+    _INT_TYPES = frozenset((ArgumentType.ENUM, ArgumentType.BYTE,
+        ArgumentType.SBYTE, ArgumentType.UBYTE, ArgumentType.USHORT,
+        ArgumentType.SHORT, ArgumentType.CINT, ArgumentType.INT,
+        ArgumentType.BOOL, ArgumentType.CBOOL))
+
+    # The types that are handled as a void pointer.
+    _VOID_PTR_TYPES = frozenset((ArgumentType.VOID, ArgumentType.STRUCT,
+        ArgumentType.UNION))
+
+    def __init__(self, spec):
+        """ Initialise the backend. """
+
+        super().__init__(spec)
+
+        # The cache of type references keyed by the id() of the wrapped
+        # object.
+        self._type_refs = {}
+
+        # The variables that don't need handlers keyed by the id() of their
+        # Python scope.  It is created when first needed.
+        self._scope_variables = None
+
+        # The kind of enums supported by the target ABI.
+        self._custom_enums_supported = spec.target_abi[0] < 13
+        self._py_enums_supported = spec.target_abi[0] == 13
+
+        # The optional features of the target ABI.
+        self._has_deprecated_message = self._abi_version_check((12, 16),
+                (13, 9))
+        self._has_next_exception_handler = self._abi_version_check((12, 9),
+                (13, 1))
+        self._has_working_char_conversion = self._abi_version_check((12, 15),
+                (13, 8))
+        self._supports_array = self._abi_version_check((12, 11), (13, 4))
+
     def g_cast_function(self, sf, klass):
         """ Generate the function that casts a C++ pointer to a target type.
         """
@@ -131,6 +188,16 @@ f'''    {cpp_name} sipCpp = static_cast<{cpp_name}>(sipConvertToEnum(sipSelf, {t
 
         sf.write('    sipInstanceDestroyedEx(&sipPySelf);\n')
 
+    # The instances tables in the order they appear in the module definition
+    # and the keys used for them in the instances state.
+    _INSTANCES_TABLES = (('class', 'typeInstances'),
+        ('voidp', 'voidPtrInstances'), ('char', 'charInstances'),
+        ('string', 'stringInstances'), ('int', 'intInstances'),
+        ('long', 'longInstances'), ('ulong', 'unsignedLongInstances'),
+        ('longlong', 'longLongInstances'),
+        ('ulonglong', 'unsignedLongLongInstances'),
+        ('double', 'doubleInstances'))
+
     def g_create_wrapped_module(self, sf, bindings,
         # TODO These will probably be generated here at some point.
         name_cache_state,
@@ -160,98 +227,68 @@ f'''    {cpp_name} sipCpp = static_cast<{cpp_name}>(sipConvertToEnum(sipSelf, {t
         typedefs_table = get_optional_ptr(module.nr_typedefs != 0,
                 'typedefsTable')
 
-        sf.write(
-f'''/* This defines this module. */
-sipExportedModuleDef sipModuleAPI_{module_name} = {{
-    SIP_NULLPTR,
-    {target_abi[1]},
-    {fq_py_name_ref},
-    0,
-    sipStrings_{module_name},
-    {imports_table},
-''')
+        fields = ['SIP_NULLPTR', str(target_abi[1]), fq_py_name_ref, '0',
+                'sipStrings_' + module_name, imports_table]
 
         if target_abi < (13, 0):
-            qt_api = get_optional_ptr(self.legacy_qt_support(), '&qtAPI')
-            sf.write(f'    {qt_api},\n')
+            fields.append(get_optional_ptr(self.legacy_qt_support(), '&qtAPI'))
 
-        sf.write(
-f'''    {len(module.needed_types)},
-    {exported_types},
-    {external_types},
-''')
+        fields.append(str(len(module.needed_types)))
+        fields.append(exported_types)
+        fields.append(external_types)
 
         if self.custom_enums_supported():
             nr_enum_members, _ = enums_state
-            enum_members = get_optional_ptr(nr_enum_members > 0,
-                    'enummembers')
-            sf.write(
-f'''    {nr_enum_members},
-    {enum_members},
-''')
-
-        veh_table = get_optional_ptr(has_virtual_error_handlers,
-                'virtErrorHandlersTable')
-        convertors = get_optional_ptr(nr_subclass_convertors > 0,
-                'convertorsTable')
-        type_instances = get_optional_ptr('class' in inst_state,
-                'typeInstances')
-        void_ptr_instances = get_optional_ptr('voidp' in inst_state,
-                'voidPtrInstances')
-        char_instances = get_optional_ptr('char' in inst_state,
-                'charInstances')
-        string_instances = get_optional_ptr('string' in inst_state,
-                'stringInstances')
-        int_instances = get_optional_ptr('int' in inst_state, 'intInstances')
-        long_instances = get_optional_ptr('long' in inst_state,
-                'longInstances')
-        unsigned_long_instances = get_optional_ptr('ulong' in inst_state,
-                'unsignedLongInstances')
-        long_long_instances = get_optional_ptr('longlong' in inst_state,
-                'longLongInstances')
-        unsigned_long_long_instances = get_optional_ptr(
-                'ulonglong' in inst_state, 'unsignedLongLongInstances')
-        double_instances = get_optional_ptr('double' in inst_state,
-                'doubleInstances')
-        module_license = get_optional_ptr(module.license is not None,
-                '&module_license')
-        exported_exceptions = get_optional_ptr(module.nr_exceptions > 0,
-                'sipExportedExceptions_' + module_name)
-        slot_extender_table = get_optional_ptr(slot_extenders,
-                'slotExtenders')
-        init_extender_table = get_optional_ptr(init_extenders,
-                'initExtenders')
-        delayed_dtors = get_optional_ptr(module.has_delayed_dtors,
-                'sipDelayedDtors')
+            fields.append(str(nr_enum_members))
+            fields.append(
+                    get_optional_ptr(nr_enum_members > 0, 'enummembers'))
+
+        fields.append(str(module.nr_typedefs))
+        fields.append(typedefs_table)
+        fields.append(
+                get_optional_ptr(has_virtual_error_handlers,
+                        'virtErrorHandlersTable'))
+        fields.append(
+                get_optional_ptr(nr_subclass_convertors > 0,
+                        'convertorsTable'))
 
-        sf.write(
-f'''    {module.nr_typedefs},
-    {typedefs_table},
-    {veh_table},
-    {convertors},
-    {{{type_instances}, {void_ptr_instances}, {char_instances}, {string_instances}, {int_instances}, {long_instances}, {unsigned_long_instances}, {long_long_instances}, {unsigned_long_long_instances}, {double_instances}}},
-    {module_license},
-    {exported_exceptions},
-    {slot_extender_table},
-    {init_extender_table},
-    {delayed_dtors},
-    SIP_NULLPTR,
-''')
+        instances = []
+
+        for instance_type, instances_table in self._INSTANCES_TABLES:
+            instances.append(
+                    get_optional_ptr(instance_type in inst_state,
+                            instances_table))
+
+        fields.append('{' + ', '.join(instances) + '}')
+
+        fields.append(
+                get_optional_ptr(module.license is not None,
+                        '&module_license'))
+        fields.append(
+                get_optional_ptr(module.nr_exceptions > 0,
+                        'sipExportedExceptions_' + module_name))
+        fields.append(get_optional_ptr(slot_extenders, 'slotExtenders'))
+        fields.append(get_optional_ptr(init_extenders, 'initExtenders'))
+        fields.append(
+                get_optional_ptr(module.has_delayed_dtors, 'sipDelayedDtors'))
+        fields.append('SIP_NULLPTR')
 
         if target_abi < (13, 0):
             # The unused version support.
-            sf.write(
-'''    SIP_NULLPTR,
-    SIP_NULLPTR,
-''')
+            fields.append('SIP_NULLPTR')
+            fields.append('SIP_NULLPTR')
+
+        fields.append(
+                get_optional_ptr(
+                        (self.abi_has_next_exception_handler() and bindings.exceptions and module.nr_exceptions > 0),
+                        'sipExceptionHandler_' + module_name))
 
-        exception_handler = get_optional_ptr(
-                (self.abi_has_next_exception_handler() and bindings.exceptions and module.nr_exceptions > 0),
-                'sipExceptionHandler_' + module_name)
+        fields = ''.join([f'    {field},\n' for field in fields])
 
         sf.write(
-f'''    {exception_handler},
-}};
+f'''/* This defines this module. */
+sipExportedModuleDef sipModuleAPI_{module_name} = {{
+{fields}}};
 ''')
 
         g_module_docstring(sf, module)
@@ -344,8 +381,8 @@ static sipPySlotDef slots_{enum_name}[] = {{
         if nr_members == 0:
             return 0, needed_enums
 
-        enum_members.sort(key=lambda v: v.scope.type_nr)
-        enum_members.sort(key=lambda v: v.py_name.name)
+        enum_members.sort(key=attrgetter('scope.type_nr'))
+        enum_members.sort(key=attrgetter('py_name.name'))
 
         if py_scope(scope) is None:
             sf.write(
@@ -859,7 +896,7 @@ f'''
 
         scope_name = scope.iface_file.fq_cpp_name.as_word
 
-        no_intro = True
+        entries = []
 
         for member_nr, member in enumerate(members):
             # Save the index in the table.
@@ -867,59 +904,82 @@ f'''
 
             py_name = member.py_name
             cached_py_name = self.cached_name_ref(py_name)
-            comma = '' if member is members[-1] else ','
+            meth = f'meth_{scope_name}_{py_name.name}'
 
             if member.no_arg_parser or member.allow_keyword_args:
-                cast = 'SIP_MLMETH_CAST('
-                cast_suffix = ')'
-                flags = '|METH_KEYWORDS'
+                meth = f'SIP_MLMETH_CAST({meth}), METH_VARARGS|METH_KEYWORDS'
             else:
-                cast = ''
-                cast_suffix = ''
-                flags = ''
+                meth += ', METH_VARARGS'
 
             if has_method_docstring(bindings, member, scope.overloads):
                 docstring = f'doc_{scope_name}_{py_name.name}'
             else:
                 docstring = 'SIP_NULLPTR'
 
-            if no_intro:
-                sf.write(
+            entries.append(f'    {{{cached_py_name}, {meth}, {docstring}}}')
+
+        if len(entries) != 0:
+            entries = ',\n'.join(entries)
+
+            sf.write(
 f'''
 
 static PyMethodDef methods_{scope_name}[] = {{
+{entries}
+}};
 ''')
 
-                no_intro = False
-
-            sf.write(f'    {{{cached_py_name}, {cast}meth_{scope_name}_{py_name.name}{cast_suffix}, METH_VARARGS{flags}, {docstring}}}{comma}\n')
-
-        if not no_intro:
-            sf.write('};\n')
-
         return len(members)
 
+    # The ABI v13 specific parts of the SIP API.
+    _SIP_API_V13 = (
+        ('sipIsEnumFlag', 'api_is_enum_flag'),
+        ('sipConvertToTypeUS', 'api_convert_to_type_us'),
+        ('sipForceConvertToTypeUS', 'api_force_convert_to_type_us'),
+        ('sipReleaseTypeUS', 'api_release_type_us'),
+    )
+
+    # The ABI v12 specific parts of the SIP API.
+    _SIP_API_V12 = (
+        ('sipSetNewUserTypeHandler', 'api_set_new_user_type_handler'),
+        ('sipGetFrame', 'api_get_frame'),
+        ('sipSetDestroyOnExit', 'api_set_destroy_on_exit'),
+        ('sipEnableOverflowChecking', 'api_enable_overflow_checking'),
+        ('sipIsAPIEnabled', 'api_is_api_enabled'),
+        ('sipClearAnySlotReference', 'api_clear_any_slot_reference'),
+        ('sipConnectRx', 'api_connect_rx'),
+        ('sipConvertRx', 'api_convert_rx'),
+        ('sipDisconnectRx', 'api_disconnect_rx'),
+        ('sipFreeSipslot', 'api_free_sipslot'),
+        ('sipInvokeSlot', 'api_invoke_slot'),
+        ('sipInvokeSlotEx', 'api_invoke_slot_ex'),
+        ('sipSameSlot', 'api_same_slot'),
+        ('sipSaveSlot', 'api_save_slot'),
+        ('sipVisitSlot', 'api_visit_slot'),
+    )
+
     def g_sip_api(self, sf, module_name, module_state):
         """ Generate the SIP API as seen by generated code. """
 
         spec = self.spec
 
         # Generate the references to (potentially) shared strings.
-        sf.write(
-'''
+        defines = ['''
 /*
  * Convenient names to refer to various strings defined in this module.
  * Only the class names are part of the public API.
  */
-''')
+''']
 
         for cached_name in module_state:
             if cached_name.used:
-                sf.write(
+                defines.append(
 f'''#define {self.cached_name_ref(cached_name, as_nr=True)} {cached_name.offset}
 #define {self.cached_name_ref(cached_name)} &sipStrings_{module_name}[{cached_name.offset}]
 ''')
 
+        sf.write(''.join(defines))
+
         sf.write(
 f'''
 #define sipMalloc                   sipAPI_{module_name}->api_malloc
@@ -1057,84 +1117,52 @@ f'''
         if spec.target_abi >= (13, 0):
             if spec.target_abi >= (13, 9):
                 # ABI v13.9 and later.
-                sf.write(
-f'''#define sipDeprecated               sipAPI_{module_name}->api_deprecated_13_9
-''')
+                api = [('sipDeprecated', 'api_deprecated_13_9')]
             else:
-                sf.write(
-f'''#define sipDeprecated               sipAPI_{module_name}->api_deprecated
-''')
+                api = [('sipDeprecated', 'api_deprecated')]
 
             # ABI v13.6 and later.
             if spec.target_abi >= (13, 6):
-                sf.write(
-f'''#define sipPyTypeDictRef            sipAPI_{module_name}->api_py_type_dict_ref
-''')
+                api.append(('sipPyTypeDictRef', 'api_py_type_dict_ref'))
 
             # ABI v13.1 and later.
             if spec.target_abi >= (13, 1):
-                sf.write(
-f'''#define sipNextExceptionHandler     sipAPI_{module_name}->api_next_exception_handler
-''')
+                api.append(
+                        ('sipNextExceptionHandler',
+                                'api_next_exception_handler'))
 
-            sf.write(
-f'''#define sipIsEnumFlag               sipAPI_{module_name}->api_is_enum_flag
-#define sipConvertToTypeUS          sipAPI_{module_name}->api_convert_to_type_us
-#define sipForceConvertToTypeUS     sipAPI_{module_name}->api_force_convert_to_type_us
-#define sipReleaseTypeUS            sipAPI_{module_name}->api_release_type_us
-''')
+            api.extend(self._SIP_API_V13)
         else:
             # ABI v12.16 and later
             if spec.target_abi >= (12, 16):
-                sf.write(
-f'''#define sipDeprecated               sipAPI_{module_name}->api_deprecated_12_16
-''')
+                api = [('sipDeprecated', 'api_deprecated_12_16')]
             else:
-                sf.write(
-f'''#define sipDeprecated               sipAPI_{module_name}->api_deprecated
-''')
+                api = [('sipDeprecated', 'api_deprecated')]
 
             # ABI v12.13 and later.
             if spec.target_abi >= (12, 13):
-                sf.write(
-f'''#define sipPyTypeDictRef            sipAPI_{module_name}->api_py_type_dict_ref
-''')
+                api.append(('sipPyTypeDictRef', 'api_py_type_dict_ref'))
 
             # ABI v12.9 and later.
             if spec.target_abi >= (12, 9):
-                sf.write(
-f'''#define sipNextExceptionHandler     sipAPI_{module_name}->api_next_exception_handler
-''')
+                api.append(
+                        ('sipNextExceptionHandler',
+                                'api_next_exception_handler'))
 
             # ABI v12.8 and earlier.
-            sf.write(
-f'''#define sipSetNewUserTypeHandler    sipAPI_{module_name}->api_set_new_user_type_handler
-#define sipGetFrame                 sipAPI_{module_name}->api_get_frame
-#define sipSetDestroyOnExit         sipAPI_{module_name}->api_set_destroy_on_exit
-#define sipEnableOverflowChecking   sipAPI_{module_name}->api_enable_overflow_checking
-#define sipIsAPIEnabled             sipAPI_{module_name}->api_is_api_enabled
-#define sipClearAnySlotReference    sipAPI_{module_name}->api_clear_any_slot_reference
-#define sipConnectRx                sipAPI_{module_name}->api_connect_rx
-#define sipConvertRx                sipAPI_{module_name}->api_convert_rx
-#define sipDisconnectRx             sipAPI_{module_name}->api_disconnect_rx
-#define sipFreeSipslot              sipAPI_{module_name}->api_free_sipslot
-#define sipInvokeSlot               sipAPI_{module_name}->api_invoke_slot
-#define sipInvokeSlotEx             sipAPI_{module_name}->api_invoke_slot_ex
-#define sipSameSlot                 sipAPI_{module_name}->api_same_slot
-#define sipSaveSlot                 sipAPI_{module_name}->api_save_slot
-#define sipVisitSlot                sipAPI_{module_name}->api_visit_slot
-''')
+            api.extend(self._SIP_API_V12)
 
         if spec.target_abi >= (12, 8):
             # ABI v12.8 and later.
-            sf.write(
-f'''#define sipIsPyMethod               sipAPI_{module_name}->api_is_py_method_12_8
-''')
+            api.append(('sipIsPyMethod', 'api_is_py_method_12_8'))
         else:
             # ABI v12.7 and earlier.
-            sf.write(
-f'''#define sipIsPyMethod               sipAPI_{module_name}->api_is_py_method
-''')
+            api.append(('sipIsPyMethod', 'api_is_py_method'))
+
+        sf.write(
+                ''.join(
+                        [f'#define {name:<27} sipAPI_{module_name}->{field}\n'
+                                for name, field in api]))
 
         # Generate the name strings.
         sf.write(
@@ -1297,29 +1325,30 @@ static sipEncodedTypeDef supers_{klass_name}[] = {{{encoded_types}}};
 ''')
 
         # The slots table.
-        is_slots = False
+        slots = []
 
         for member in klass.members:
             if member.py_slot is None:
                 continue
 
-            if not is_slots:
-                sf.write(
+            slot_ref = self.get_slot_ref(member.py_slot)
+            member_name = member.py_name
+            slots.append(f'    {{(void *)slot_{klass_name}_{member_name}, {slot_ref}}},\n')
+
+        is_slots = len(slots) != 0
+
+        if is_slots:
+            slots = ''.join(slots)
+
+            sf.write(
 f'''
 
 /* Define this type's Python slots. */
 static sipPySlotDef slots_{klass_name}[] = {{
+{slots}    {{0, (sipPySlotType)0}}
+}};
 ''')
 
-                is_slots = True
-
-            slot_ref = self.get_slot_ref(member.py_slot)
-            member_name = member.py_name
-            sf.write(f'    {{(void *)slot_{klass_name}_{member_name}, {slot_ref}}},\n')
-
-        if is_slots:
-            sf.write('    {0, (sipPySlotType)0}\n};\n')
-
         # The attributes tables.
         nr_methods = g_class_method_table(self, sf, bindings, klass)
         nr_enum_members, _ = self.g_enums_specifications(sf, bindings,
@@ -1348,55 +1377,61 @@ static sipPySlotDef slots_{klass_name}[] = {{
 
         # The variables table.
         if nr_variables != 0:
-            sf.write(f'\nsipVariableDef variables_{klass_name}[] = {{\n')
+            table = [f'\nsipVariableDef variables_{klass_name}[] = {{\n']
 
-        for prop in klass.properties:
-            fields = ['PropertyVariable', self.cached_name_ref(prop.name)]
+            # Map the names of the members to the first member with that name
+            # (as find_method() would) so that each property doesn't need to
+            # search them.
+            members = {member.py_name.name: member
+                    for member in reversed(klass.members)}
 
-            getter_nr = find_method(klass, prop.getter).member_nr
-            fields.append(f'&methods_{klass_name}[{getter_nr}]')
+            for prop in klass.properties:
+                fields = ['PropertyVariable', self.cached_name_ref(prop.name)]
 
-            if prop.setter is None:
-                fields.append('SIP_NULLPTR')
-            else:
-                setter_nr = find_method(klass, prop.setter).member_nr
-                fields.append(f'&methods_{klass_name}[{setter_nr}]')
+                getter_nr = members[prop.getter].member_nr
+                fields.append(f'&methods_{klass_name}[{getter_nr}]')
 
-            # We don't support a deleter yet.
-            fields.append('SIP_NULLPTR')
+                if prop.setter is None:
+                    fields.append('SIP_NULLPTR')
+                else:
+                    setter_nr = members[prop.setter].member_nr
+                    fields.append(f'&methods_{klass_name}[{setter_nr}]')
 
-            if prop.docstring is None:
+                # We don't support a deleter yet.
                 fields.append('SIP_NULLPTR')
-            else:
-                fields.append(f'doc_{klass_name}_{prop.name}')
 
-            fields = ', '.join(fields)
-            sf.write(f'    {{{fields}}},\n')
+                if prop.docstring is None:
+                    fields.append('SIP_NULLPTR')
+                else:
+                    fields.append(f'doc_{klass_name}_{prop.name}')
 
-        if klass.has_variable_handlers:
-            for variable in spec.variables:
-                if variable.scope is klass and variable.needs_handler:
-                    variable_name = variable.fq_cpp_name.as_word
+                fields = ', '.join(fields)
+                table.append(f'    {{{fields}}},\n')
 
-                    fields = []
+            if klass.has_variable_handlers:
+                for variable in spec.variables:
+                    if variable.scope is klass and variable.needs_handler:
+                        variable_name = variable.fq_cpp_name.as_word
 
-                    fields.append('ClassVariable' if variable.is_static else 'InstanceVariable')
-                    fields.append(self.cached_name_ref(variable.py_name))
-                    fields.append('(PyMethodDef *)varget_' + variable_name)
+                        fields = []
 
-                    if _can_set_variable(variable):
-                        fields.append('(PyMethodDef *)varset_' + variable_name)
-                    else:
-                        fields.append('SIP_NULLPTR')
+                        fields.append('ClassVariable' if variable.is_static else 'InstanceVariable')
+                        fields.append(self.cached_name_ref(variable.py_name))
+                        fields.append('(PyMethodDef *)varget_' + variable_name)
 
-                    fields.append('SIP_NULLPTR')
-                    fields.append('SIP_NULLPTR')
+                        if _can_set_variable(variable):
+                            fields.append('(PyMethodDef *)varset_' + variable_name)
+                        else:
+                            fields.append('SIP_NULLPTR')
 
-                    fields = ', '.join(fields)
-                    sf.write(f'    {{{fields}}},\n')
+                        fields.append('SIP_NULLPTR')
+                        fields.append('SIP_NULLPTR')
 
-        if nr_variables != 0:
-            sf.write('};\n')
+                        fields = ', '.join(fields)
+                        table.append(f'    {{{fields}}},\n')
+
+            table.append('};\n')
+            sf.write(''.join(table))
 
         # Generate the static variables table.
         sv_state = self.g_static_variables_table(sf, scope=klass)
@@ -1457,38 +1492,10 @@ static sipPySlotDef slots_{klass_name}[] = {{
             container_fields.append(
                     str(nr_variables) + ', variables_' + klass_name)
 
-        instances = []
-
-        instances.append(
-                _class_object_ref('class' in sv_state, 'typeInstances',
-                        klass_name))
-        instances.append(
-                _class_object_ref('voidp' in sv_state, 'voidPtrInstances',
-                        klass_name))
-        instances.append(
-                _class_object_ref('char' in sv_state, 'charInstances',
-                        klass_name))
-        instances.append(
-                _class_object_ref('string' in sv_state, 'stringInstances',
-                        klass_name))
-        instances.append(
-                _class_object_ref('int' in sv_state, 'intInstances',
-                        klass_name))
-        instances.append(
-                _class_object_ref('long' in sv_state, 'longInstances',
-                        klass_name))
-        instances.append(
-                _class_object_ref('ulong' in sv_state, 'unsignedLongInstances',
-                        klass_name))
-        instances.append(
-                _class_object_ref('longlong' in sv_state, 'longLongInstances',
-                        klass_name))
-        instances.append(
-                _class_object_ref('ulonglong' in sv_state,
-                        'unsignedLongLongInstances', klass_name))
-        instances.append(
-                _class_object_ref('double' in sv_state, 'doubleInstances',
-                        klass_name))
+        instances = [
+                _class_object_ref(instance_type in sv_state, instances_table,
+                        klass_name)
+                for instance_type, instances_table in self._INSTANCES_TABLES]
 
         container_fields.append('{' + ', '.join(instances) + '}')
 
@@ -1608,24 +1615,24 @@ f'''static void *init_type_{klass_name}(sipSimpleWrapper *{sip_self}, PyObject *
         """ Return True if the ABI implements sipDeprecated() with a message.
         """
 
-        return self._abi_version_check((12, 16), (13, 9))
+        return self._has_deprecated_message
 
     def abi_has_next_exception_handler(self):
         """ Return True if the ABI implements sipNextExceptionHandler(). """
 
-        return self._abi_version_check((12, 9), (13, 1))
+        return self._has_next_exception_handler
 
     def abi_has_working_char_conversion(self):
         """ Return True if the ABI has working char to/from a Python integer
         converters (ie. char is not assumed to be signed).
         """
 
-        return self._abi_version_check((12, 15), (13, 8))
+        return self._has_working_char_conversion
 
     def abi_supports_array(self):
         """ Return True if the ABI supports sip.array. """
 
-        return self._abi_version_check((12, 11), (13, 4))
+        return self._supports_array
 
     @staticmethod
     def cached_name_ref(cached_name, as_nr=False):
@@ -1638,7 +1645,7 @@ f'''static void *init_type_{klass_name}(sipSimpleWrapper *{sip_self}, PyObject *
     def custom_enums_supported(self):
         """ Return True if custom enums are supported. """
 
-        return self.spec.target_abi[0] < 13
+        return self._custom_enums_supported
 
     def get_enum_to_py_conversion(self, enum, value_name):
         """ Return the code to convert a C/C++ enum to a Python object. """
@@ -1661,15 +1668,24 @@ f'''static void *init_type_{klass_name}(sipSimpleWrapper *{sip_self}, PyObject *
 
         return f'sipImportedTypes_{spec.module.py_name}_{enum.module.py_name}[{enum.type_nr}].it_td'
 
+    # The ABI dependent part of a Python method signature keyed by whether the
+    # self and args arguments are named.
+    _PY_METHOD_ARGS = {
+        (False, False): 'PyObject *, PyObject *',
+        (False, True): 'PyObject *, PyObject *sipArgs',
+        (True, False): 'PyObject *sipSelf, PyObject *',
+        (True, True): 'PyObject *sipSelf, PyObject *sipArgs',
+    }
+
     def get_py_method_args(self, *, is_impl, need_self=False, need_args=True):
         """ Return the part of a Python method signature that are ABI
         dependent.
         """
 
-        self_name = 'sipSelf' if is_impl and (self.spec.c_bindings or need_self) else ''
-        args_name = 'sipArgs' if is_impl and need_args else ''
+        named_self = bool(is_impl and (self.spec.c_bindings or need_self))
+        named_args = bool(is_impl and need_args)
 
-        return f'PyObject *{self_name}, PyObject *{args_name}'
+        return self._PY_METHOD_ARGS[named_self, named_args]
 
     @staticmethod
     def get_raise_unknown_exception():
@@ -1726,13 +1742,19 @@ f'''static void *init_type_{klass_name}(sipSimpleWrapper *{sip_self}, PyObject *
 
         return 'Def'
 
-    @staticmethod
-    def get_type_ref(wrapped_object):
+    def get_type_ref(self, wrapped_object):
         """ Return the reference to the type of a wrapped object. """
 
-        fq_cpp_name = wrapped_object.fq_cpp_name if isinstance(wrapped_object, WrappedEnum) else wrapped_object.iface_file.fq_cpp_name
+        # The same type is referred to many times so cache the reference.
+        type_ref = self._type_refs.get(id(wrapped_object))
 
-        return 'sipType_' + fq_cpp_name.as_word
+        if type_ref is None:
+            fq_cpp_name = wrapped_object.fq_cpp_name if isinstance(wrapped_object, WrappedEnum) else wrapped_object.iface_file.fq_cpp_name
+
+            type_ref = 'sipType_' + fq_cpp_name.as_word
+            self._type_refs[id(wrapped_object)] = type_ref
+
+        return type_ref
 
     @staticmethod
     def get_types_table_decl(module):
@@ -1772,7 +1794,7 @@ f'''static void *init_type_{klass_name}(sipSimpleWrapper *{sip_self}, PyObject *
     def py_enums_supported(self):
         """ Return True if Python enums are supported. """
 
-        return self.spec.target_abi[0] == 13
+        return self._py_enums_supported
 
     def _abi_version_check(self, min_12, min_13):
         """ Return True if the ABI version meets minimum version requirements.
@@ -1853,15 +1875,17 @@ f'    {{{{{v12_fields}SIP_NULLPTR, {sip_type}, sipNameNr_{cpp_name}, SIP_NULLPTR
 
         instances = []
 
-        for variable in variables_in_scope(self.spec, scope):
-            if variable.type.type not in (ArgumentType.ASCII_STRING, ArgumentType.LATIN1_STRING, ArgumentType.UTF8_STRING, ArgumentType.SSTRING, ArgumentType.USTRING, ArgumentType.STRING) or len(variable.type.derefs) != 0:
+        for variable in self._variables_in_scope(scope):
+            variable_type = variable.type.type
+
+            if variable_type not in self._CHAR_STRING_TYPES or len(variable.type.derefs) != 0:
                 continue
 
             ci_name = self.cached_name_ref(variable.py_name)
             ci_val = variable.fq_cpp_name.cpp_stripped(STRIP_GLOBAL)
             ci_encoding = _get_encoding(variable.type)
 
-            if variable.type.type is ArgumentType.USTRING:
+            if variable_type is ArgumentType.USTRING:
                 ci_val = '(char)' + ci_val;
 
             instances.append((ci_name, ci_val, ci_encoding))
@@ -1878,8 +1902,10 @@ static sipCharInstanceDef charInstances{suffix}[]''')
         spec = self.spec
         instances = []
 
-        for variable in variables_in_scope(spec, scope):
-            if variable.type.type is not ArgumentType.CLASS and (variable.type.type is not ArgumentType.ENUM or variable.type.definition.fq_cpp_name is None):
+        for variable in self._variables_in_scope(scope):
+            variable_type = variable.type.type
+
+            if variable_type is not ArgumentType.CLASS and (variable_type is not ArgumentType.ENUM or variable.type.definition.fq_cpp_name is None):
                 continue
 
             # Skip ordinary C++ class instances which need to be done with
@@ -1895,7 +1921,7 @@ static sipCharInstanceDef charInstances{suffix}[]''')
             ti_type = '&' + self.get_type_ref(variable.type.definition)
             ti_flags = '0'
 
-            if variable.type.type is ArgumentType.CLASS:
+            if variable_type is ArgumentType.CLASS:
                 if variable.access_code is not None:
                     ti_ptr = '(void *)access_' + variable.fq_cpp_name.as_word
                     ti_flags = 'SIP_ACCFUNC|SIP_NOT_IN_MAP'
@@ -1921,8 +1947,10 @@ static sipTypeInstanceDef typeInstances{suffix}[]''')
 
         instances = []
 
-        for variable in variables_in_scope(self.spec, scope):
-            if variable.type.type not in (ArgumentType.FLOAT, ArgumentType.CFLOAT, ArgumentType.DOUBLE, ArgumentType.CDOUBLE):
+        for variable in self._variables_in_scope(scope):
+            variable_type = variable.type.type
+
+            if variable_type not in self._FLOATING_POINT_TYPES:
                 continue
 
             di_name = self.cached_name_ref(variable.py_name)
@@ -1960,12 +1988,14 @@ static sipDoubleInstanceDef doubleInstances{suffix}[]''')
                     instances.append((ii_name, ii_val))
 
         # Handle int variables.
-        for variable in variables_in_scope(spec, scope):
-            if variable.type.type not in (ArgumentType.ENUM, ArgumentType.BYTE, ArgumentType.SBYTE, ArgumentType.UBYTE, ArgumentType.USHORT, ArgumentType.SHORT, ArgumentType.CINT, ArgumentType.INT, ArgumentType.BOOL, ArgumentType.CBOOL):
+        for variable in self._variables_in_scope(scope):
+            variable_type = variable.type.type
+
+            if variable_type not in self._INT_TYPES:
                 continue
 
             # Named enums are handled elsewhere.
-            if variable.type.type is ArgumentType.ENUM and variable.type.definition.fq_cpp_name is not None:
+            if variable_type is ArgumentType.ENUM and variable.type.definition.fq_cpp_name is not None:
                 continue
 
             ii_name = self.cached_name_ref(variable.py_name)
@@ -2012,14 +2042,16 @@ static sipIntInstanceDef intInstances{suffix}[]''')
 
         instances = []
 
-        for variable in variables_in_scope(self.spec, scope):
-            if (variable.type.type not in (ArgumentType.ASCII_STRING, ArgumentType.LATIN1_STRING, ArgumentType.UTF8_STRING, ArgumentType.SSTRING, ArgumentType.USTRING, ArgumentType.STRING) or len(variable.type.derefs) == 0) and variable.type.type is not ArgumentType.WSTRING:
+        for variable in self._variables_in_scope(scope):
+            variable_type = variable.type.type
+
+            if (variable_type not in self._CHAR_STRING_TYPES or len(variable.type.derefs) == 0) and variable_type is not ArgumentType.WSTRING:
                 continue
 
-            if variable.type.type in (ArgumentType.SSTRING, ArgumentType.USTRING, ArgumentType.WSTRING):
+            if variable_type in (ArgumentType.SSTRING, ArgumentType.USTRING, ArgumentType.WSTRING):
                 cast = '(const char *)'
 
-                if variable.type.type is ArgumentType.WSTRING and len(variable.type.derefs) == 0:
+                if variable_type is ArgumentType.WSTRING and len(variable.type.derefs) == 0:
                     cast += '&'
             else:
                 cast = ''
@@ -2057,8 +2089,10 @@ static sipStringInstanceDef stringInstances{suffix}[]''')
 
         instances = []
 
-        for variable in variables_in_scope(self.spec, scope):
-            if variable.type.type not in (ArgumentType.VOID, ArgumentType.STRUCT, ArgumentType.UNION):
+        for variable in self._variables_in_scope(scope):
+            variable_type = variable.type.type
+
+            if variable_type not in self._VOID_PTR_TYPES:
                 continue
 
             vi_name = self.cached_name_ref(variable.py_name)
@@ -2189,57 +2223,32 @@ f'''
 }
 ''')
 
-    @staticmethod
-    def _g_module_function_table_entries(sf, bindings, module, members):
-        """ Generate the entries in a table of PyMethodDef for module functions.
-        """
-
-        for member in members:
-            if member.py_slot is None:
-                py_name = get_normalised_cached_name(member.py_name)
-                sf.write(f'        {{sipName_{py_name}, ')
-
-                if member.no_arg_parser or member.allow_keyword_args:
-                    sf.write(f'SIP_MLMETH_CAST(func_{member.py_name.name}), METH_VARARGS|METH_KEYWORDS')
-                else:
-                    sf.write(f'func_{member.py_name.name}, METH_VARARGS')
-
-                docstring_ref = get_optional_ptr(
-                        has_method_docstring(bindings, member,
-                                module.overloads),
-                        'doc_' + member.py_name.name)
-                sf.write(f', {docstring_ref}}},\n')
-
     def _g_module_functions_table(self, sf, bindings, module):
         """ Generate the table of module functions and return True if anything
         was actually generated.
         """
 
-        # We always generate a table.
-        sf.write('    static PyMethodDef sip_methods[] = {\n')
-
-        self._g_module_function_table_entries(sf, bindings, module,
+        entries = self._get_module_function_table_entries(bindings, module,
                 module.global_functions)
 
-        # Generate the global functions for any hidden namespaces.
+        # Add the global functions for any hidden namespaces.
         for klass in self.spec.classes:
             if klass.iface_file.module is module and klass.is_hidden_namespace:
-                self._g_module_function_table_entries(sf, bindings, module,
-                        klass.members)
+                entries.extend(
+                        self._get_module_function_table_entries(bindings,
+                                module, klass.members))
 
+        entries = ''.join(entries)
+
+        # We always generate a table.
         sf.write(
-'''        {SIP_NULLPTR, SIP_NULLPTR, 0, SIP_NULLPTR}
-    };
+f'''    static PyMethodDef sip_methods[] = {{
+{entries}        {{SIP_NULLPTR, SIP_NULLPTR, 0, SIP_NULLPTR}}
+    }};
 ''')
 
         return True
 
-    # The types that are implemented as PyObject*.
-    _PY_OBJECT_TYPES = (ArgumentType.PYOBJECT, ArgumentType.PYTUPLE,
-        ArgumentType.PYLIST, ArgumentType.PYDICT, ArgumentType.PYCALLABLE,
-        ArgumentType.PYSLICE, ArgumentType.PYTYPE, ArgumentType.PYBUFFER,
-        ArgumentType.PYENUM)
-
     def _g_py_objects(self, sf):
         """ Generate the inline code to add a set of Python objects to a module
         dictionary.
@@ -2379,7 +2388,7 @@ f'''    if ((sipAPI_{module_name} = sip_init_library(sipModuleDict)) == SIP_NULL
         first_arg = 'sipSelf' if spec.c_bindings or not variable.is_static else ''
         last_arg = get_use_in_code(variable.get_code, 'sipPyType', spec=spec)
 
-        needs_new = (variable_type in (ArgumentType.CLASS, ArgumentType.MAPPED) and len(variable.type.derefs) == 0 and variable.type.is_const)
+        needs_new = (variable_type in self._WRAPPED_TYPES and len(variable.type.derefs) == 0 and variable.type.is_const)
 
         # If the variable is itself a non-const instance of a wrapped class
         # then two things must happen.  Firstly, the getter must return the
@@ -2398,12 +2407,14 @@ f'''    if ((sipAPI_{module_name} = sip_init_library(sipModuleDict)) == SIP_NULL
         var_key = self_key = 0
 
         if variable_type is ArgumentType.CLASS and len(variable.type.derefs) == 0 and not variable.type.is_const:
-            var_key = variable.type.definition.iface_file.module.next_key
-            variable.type.definition.iface_file.module.next_key -= 1
+            type_module = variable.type.definition.iface_file.module
+            var_key = type_module.next_key
+            type_module.next_key -= 1
 
             if not variable.is_static:
-                self_key = variable.module.next_key
-                variable.module.next_key -= 1
+                module = variable.module
+                self_key = module.next_key
+                module.next_key -= 1
 
         second_arg = 'sipPySelf' if spec.c_bindings or var_key < 0 else ''
         variable_as_word = variable.fq_cpp_name.as_word
@@ -2491,7 +2502,7 @@ f'''    sipPy = sipGetReference(sipPySelf, {self_key});
         else:
             sf.write('    sipVal = ')
 
-            if variable_type in (ArgumentType.CLASS, ArgumentType.MAPPED) and len(variable.type.derefs) == 0:
+            if variable_type in self._WRAPPED_TYPES and len(variable.type.derefs) == 0:
                 sf.write('&')
 
         sf.write(self._get_variable_member(variable))
@@ -2501,7 +2512,7 @@ f'''    sipPy = sipGetReference(sipPySelf, {self_key});
 
         sf.write(';\n\n')
 
-        if variable_type in (ArgumentType.CLASS, ArgumentType.MAPPED):
+        if variable_type in self._WRAPPED_TYPES:
             prefix_s = 'sipPy =' if var_key < 0 else 'return'
             new_s = 'New' if needs_new else ''
             sip_val_s = get_const_cast(spec, variable.type, 'sipVal')
@@ -2525,7 +2536,7 @@ f'''
     return sipPy;
 ''')
 
-        elif variable_type in (ArgumentType.BOOL, ArgumentType.CBOOL):
+        elif variable_type in self._BOOL_TYPES:
             sf.write('    return PyBool_FromLong(sipVal);\n')
 
         elif variable_type is ArgumentType.ASCII_STRING:
@@ -2600,10 +2611,10 @@ f'''    if (sipVal == SIP_NULLPTR)
     return PyUnicode_FromWideChar(sipVal, (Py_ssize_t)wcslen(sipVal));
 ''')
 
-        elif variable_type in (ArgumentType.FLOAT, ArgumentType.CFLOAT):
+        elif variable_type in self._FLOAT_TYPES:
             sf.write('    return PyFloat_FromDouble((double)sipVal);\n')
 
-        elif variable_type in (ArgumentType.DOUBLE, ArgumentType.CDOUBLE):
+        elif variable_type in self._DOUBLE_TYPES:
             sf.write('    return PyFloat_FromDouble(sipVal);\n')
 
         elif variable_type is ArgumentType.ENUM:
@@ -2631,7 +2642,7 @@ f'''    if (sipVal == SIP_NULLPTR)
         elif variable_type is ArgumentType.ULONGLONG:
             sf.write('    return PyLong_FromUnsignedLongLong(sipVal);\n')
 
-        elif variable_type in (ArgumentType.STRUCT, ArgumentType.UNION, ArgumentType.VOID):
+        elif variable_type in self._VOID_PTR_TYPES:
             const_s = 'Const' if variable.type.is_const else ''
             cast_s = get_void_ptr_cast(variable.type)
 
@@ -2642,7 +2653,7 @@ f'''    if (sipVal == SIP_NULLPTR)
 
             sf.write(f'    return PyCapsule_New({cast_s}sipVal, "{variable.type.definition.as_cpp}", SIP_NULLPTR);\n')
 
-        elif variable_type in (ArgumentType.PYOBJECT, ArgumentType.PYTUPLE, ArgumentType.PYLIST, ArgumentType.PYDICT, ArgumentType.PYCALLABLE, ArgumentType.PYSLICE, ArgumentType.PYTYPE, ArgumentType.PYBUFFER, ArgumentType.PYENUM):
+        elif variable_type in self._PY_OBJECT_TYPES:
             sf.write(
 '''    Py_XINCREF(sipVal);
     return sipVal;
@@ -2714,7 +2725,7 @@ f'''static int varset_{variable_as_word}(void *{first_arg}, PyObject *{sip_py},
 
         has_state = False
 
-        if variable_type in (ArgumentType.CLASS, ArgumentType.MAPPED):
+        if variable_type in self._WRAPPED_TYPES:
             sf.write('    int sipIsErr = 0;\n')
 
             if len(variable.type.derefs) == 0:
@@ -2735,7 +2746,7 @@ f'''static int varset_{variable_as_word}(void *{first_arg}, PyObject *{sip_py},
 
         deref = ''
 
-        if variable_type in (ArgumentType.CLASS, ArgumentType.MAPPED):
+        if variable_type in self._WRAPPED_TYPES:
             if len(variable.type.derefs) == 0:
                 deref = '*'
 
@@ -2754,7 +2765,7 @@ f'''
 
         member = self._get_variable_member(variable)
 
-        if variable_type in (ArgumentType.PYOBJECT, ArgumentType.PYTUPLE, ArgumentType.PYLIST, ArgumentType.PYDICT, ArgumentType.PYCALLABLE, ArgumentType.PYSLICE, ArgumentType.PYTYPE, ArgumentType.PYBUFFER, ArgumentType.PYENUM):
+        if variable_type in self._PY_OBJECT_TYPES:
             sf.write(
 f'''    Py_XDECREF({member});
     Py_INCREF(sipVal);
@@ -2816,6 +2827,35 @@ f'''
 
         return f'static_cast<int>({get_enum_member(self.spec, enum_member)})'
 
+    @staticmethod
+    def _get_module_function_table_entries(bindings, module, members):
+        """ Return the list of entries in a table of PyMethodDef for module
+        functions.
+        """
+
+        with_docstrings = get_members_with_docstrings(bindings,
+                module.overloads)
+        entries = []
+
+        for member in members:
+            if member.py_slot is not None:
+                continue
+
+            cached_name = get_normalised_cached_name(member.py_name)
+            py_name = member.py_name.name
+
+            if member.no_arg_parser or member.allow_keyword_args:
+                meth = f'SIP_MLMETH_CAST(func_{py_name}), METH_VARARGS|METH_KEYWORDS'
+            else:
+                meth = f'func_{py_name}, METH_VARARGS'
+
+            docstring_ref = get_optional_ptr(id(member) in with_docstrings,
+                    'doc_' + py_name)
+
+            entries.append(f'        {{sipName_{cached_name}, {meth}, {docstring_ref}}},\n')
+
+        return entries
+
     def _get_variable_member(self, variable):
         """ Return the member variable of a class. """
 
@@ -2827,6 +2867,57 @@ f'''
         return scope
 
 
+    # The statements to convert a Python object to a C/C++ value of a type
+    # that doesn't need any more information about the variable.
+    _SIMPLE_TO_CPP = {
+        ArgumentType.FLOAT: '(float)PyFloat_AsDouble(sipPy)',
+        ArgumentType.CFLOAT: '(float)PyFloat_AsDouble(sipPy)',
+        ArgumentType.DOUBLE: 'PyFloat_AsDouble(sipPy)',
+        ArgumentType.CDOUBLE: 'PyFloat_AsDouble(sipPy)',
+        ArgumentType.BOOL: 'sipConvertToBool(sipPy)',
+        ArgumentType.CBOOL: 'sipConvertToBool(sipPy)',
+        ArgumentType.BYTE: 'sipLong_AsChar(sipPy)',
+        ArgumentType.SBYTE: 'sipLong_AsSignedChar(sipPy)',
+        ArgumentType.UBYTE: 'sipLong_AsUnsignedChar(sipPy)',
+        ArgumentType.USHORT: 'sipLong_AsUnsignedShort(sipPy)',
+        ArgumentType.SHORT: 'sipLong_AsShort(sipPy)',
+        ArgumentType.UINT: 'sipLong_AsUnsignedInt(sipPy)',
+        ArgumentType.SIZE: 'sipLong_AsSizeT(sipPy)',
+        ArgumentType.INT: 'sipLong_AsInt(sipPy)',
+        ArgumentType.CINT: 'sipLong_AsInt(sipPy)',
+        ArgumentType.ULONG: 'sipLong_AsUnsignedLong(sipPy)',
+        ArgumentType.LONG: 'sipLong_AsLong(sipPy)',
+        ArgumentType.ULONGLONG: 'sipLong_AsUnsignedLongLong(sipPy)',
+        ArgumentType.LONGLONG: 'sipLong_AsLongLong(sipPy)',
+        ArgumentType.VOID: 'sipConvertToVoidPtr(sipPy)',
+    }
+
+    # The statements to convert a Python object to a C/C++ string type for a
+    # single character, a const string and a non-const string.
+    _STRING_TO_CPP = {
+        ArgumentType.SSTRING: ('(signed char)sipBytes_AsChar(sipPy)',
+                '(const signed char *)sipBytes_AsString(sipPy)',
+                '(signed char *)sipBytes_AsString(sipPy)'),
+        ArgumentType.USTRING: ('(unsigned char)sipBytes_AsChar(sipPy)',
+                '(const unsigned char *)sipBytes_AsString(sipPy)',
+                '(unsigned char *)sipBytes_AsString(sipPy)'),
+        ArgumentType.ASCII_STRING: ('sipString_AsASCIIChar(sipPy)',
+                'sipString_AsASCIIString(&sipPy)',
+                '(char *)sipString_AsASCIIString(&sipPy)'),
+        ArgumentType.LATIN1_STRING: ('sipString_AsLatin1Char(sipPy)',
+                'sipString_AsLatin1String(&sipPy)',
+                '(char *)sipString_AsLatin1String(&sipPy)'),
+        ArgumentType.UTF8_STRING: ('sipString_AsUTF8Char(sipPy)',
+                'sipString_AsUTF8String(&sipPy)',
+                '(char *)sipString_AsUTF8String(&sipPy)'),
+        ArgumentType.STRING: ('sipBytes_AsChar(sipPy)',
+                'sipBytes_AsString(sipPy)',
+                '(char *)sipBytes_AsString(sipPy)'),
+        ArgumentType.WSTRING: ('sipUnicode_AsWChar(sipPy)',
+                'sipUnicode_AsWString(sipPy)',
+                'sipUnicode_AsWString(sipPy)'),
+    }
+
     def _get_variable_to_cpp(self, variable, has_state):
         """ Return the statement to convert a Python variable to C/C++. """
 
@@ -2836,7 +2927,7 @@ f'''
 
         variable_type = variable.type.type
 
-        if variable_type in (ArgumentType.CLASS, ArgumentType.MAPPED):
+        if variable_type in self._WRAPPED_TYPES:
             if spec.c_bindings:
                 statement = f'({type_s} *)'
                 cast_tail = ''
@@ -2862,111 +2953,22 @@ f'''
         elif variable_type is ArgumentType.ENUM:
             statement = f'({type_s})sipConvertToEnum(sipPy, {self.get_type_ref(variable.type.definition)})'
 
-        elif variable_type is ArgumentType.SSTRING:
-            if len(variable.type.derefs) == 0:
-                statement = '(signed char)sipBytes_AsChar(sipPy)'
-            elif variable.type.is_const:
-                statement = '(const signed char *)sipBytes_AsString(sipPy)'
-            else:
-                statement = '(signed char *)sipBytes_AsString(sipPy)'
+        elif variable_type in self._STRING_TO_CPP:
+            char_s, const_s, non_const_s = self._STRING_TO_CPP[variable_type]
 
-        elif variable_type is ArgumentType.USTRING:
-            if len(variable.type.derefs) == 0:
-                statement = '(unsigned char)sipBytes_AsChar(sipPy)'
-            elif variable.type.is_const:
-                statement = '(const unsigned char *)sipBytes_AsString(sipPy)'
-            else:
-                statement = '(unsigned char *)sipBytes_AsString(sipPy)'
-
-        elif variable_type is ArgumentType.ASCII_STRING:
-            if len(variable.type.derefs) == 0:
-                statement = 'sipString_AsASCIIChar(sipPy)'
-            elif variable.type.is_const:
-                statement = 'sipString_AsASCIIString(&sipPy)'
-            else:
-                statement = '(char *)sipString_AsASCIIString(&sipPy)'
-
-        elif variable_type is ArgumentType.LATIN1_STRING:
             if len(variable.type.derefs) == 0:
-                statement = 'sipString_AsLatin1Char(sipPy)'
+                statement = char_s
             elif variable.type.is_const:
-                statement = 'sipString_AsLatin1String(&sipPy)'
+                statement = const_s
             else:
-                statement = '(char *)sipString_AsLatin1String(&sipPy)'
-
-        elif variable_type is ArgumentType.UTF8_STRING:
-            if len(variable.type.derefs) == 0:
-                statement = 'sipString_AsUTF8Char(sipPy)'
-            elif variable.type.is_const:
-                statement = 'sipString_AsUTF8String(&sipPy)'
-            else:
-                statement = '(char *)sipString_AsUTF8String(&sipPy)'
-
-        elif variable_type is ArgumentType.STRING:
-            if len(variable.type.derefs) == 0:
-                statement = 'sipBytes_AsChar(sipPy)'
-            elif variable.type.is_const:
-                statement = 'sipBytes_AsString(sipPy)'
-            else:
-                statement = '(char *)sipBytes_AsString(sipPy)'
-
-        elif variable_type is ArgumentType.WSTRING:
-            if len(variable.type.derefs) == 0:
-                statement = 'sipUnicode_AsWChar(sipPy)'
-            else:
-                statement = 'sipUnicode_AsWString(sipPy)'
-
-        elif variable_type in (ArgumentType.FLOAT, ArgumentType.CFLOAT):
-            statement = '(float)PyFloat_AsDouble(sipPy)'
+                statement = non_const_s
 
-        elif variable_type in (ArgumentType.DOUBLE, ArgumentType.CDOUBLE):
-            statement = 'PyFloat_AsDouble(sipPy)'
-
-        elif variable_type in (ArgumentType.BOOL, ArgumentType.CBOOL):
-            statement = 'sipConvertToBool(sipPy)'
-
-        elif variable_type is ArgumentType.BYTE:
-            statement = 'sipLong_AsChar(sipPy)'
-
-        elif variable_type is ArgumentType.SBYTE:
-            statement = 'sipLong_AsSignedChar(sipPy)'
-
-        elif variable_type is ArgumentType.UBYTE:
-            statement = 'sipLong_AsUnsignedChar(sipPy)'
-
-        elif variable_type is ArgumentType.USHORT:
-            statement = 'sipLong_AsUnsignedShort(sipPy)'
-
-        elif variable_type is ArgumentType.SHORT:
-            statement = 'sipLong_AsShort(sipPy)'
-
-        elif variable_type is ArgumentType.UINT:
-            statement = 'sipLong_AsUnsignedInt(sipPy)'
-
-        elif variable_type is ArgumentType.SIZE:
-            statement = 'sipLong_AsSizeT(sipPy)'
-
-        elif variable_type in (ArgumentType.INT, ArgumentType.CINT):
-            statement = 'sipLong_AsInt(sipPy)'
-
-        elif variable_type is ArgumentType.ULONG:
-            statement = 'sipLong_AsUnsignedLong(sipPy)'
-
-        elif variable_type is ArgumentType.LONG:
-            statement = 'sipLong_AsLong(sipPy)'
-
-        elif variable_type is ArgumentType.ULONGLONG:
-            statement = 'sipLong_AsUnsignedLongLong(sipPy)'
-
-        elif variable_type is ArgumentType.LONGLONG:
-            statement = 'sipLong_AsLongLong(sipPy)'
+        elif variable_type in self._SIMPLE_TO_CPP:
+            statement = self._SIMPLE_TO_CPP[variable_type]
 
         elif variable_type in (ArgumentType.STRUCT, ArgumentType.UNION):
             statement = f'({type_s} *)sipConvertToVoidPtr(sipPy)'
 
-        elif variable_type is ArgumentType.VOID:
-            statement = 'sipConvertToVoidPtr(sipPy)'
-
         elif variable_type is ArgumentType.CAPSULE:
             statement = f'PyCapsule_GetPointer(sipPy, "{variable.type.definition.as_cpp}")'
 
@@ -3002,6 +3004,33 @@ f'''
 
         return auto_docstring
 
+    def _variables_in_scope(self, scope):
+        """ Return the sequence of variables in a scope that don't need
+        handlers.
+        """
+
+        # Index all the variables of the module the first time through.
+        if self._scope_variables is None:
+            spec = self.spec
+            self._scope_variables = {}
+
+            for variable in spec.variables:
+                if variable.module is spec.module and not variable.needs_handler:
+                    self._scope_variables.setdefault(
+                            id(py_scope(variable.scope)), []).append(variable)
+
+        return self._scope_variables.get(id(scope), ())
+
+    # The types that are added to the table of another type.  We treat unsigned
+    # and size_t as unsigned long as we don't generate a separate table for
+    # them.  Likewise we treat Py_hash_t and Py_ssize_t as long.
+    _INT_INSTANCE_TYPES = {
+        ArgumentType.UINT: ArgumentType.ULONG,
+        ArgumentType.SIZE: ArgumentType.ULONG,
+        ArgumentType.HASH: ArgumentType.LONG,
+        ArgumentType.SSIZE: ArgumentType.LONG,
+    }
+
     def _write_int_instances(self, sf, scope, target_type, type_name):
         """ Generate the code to add a set of a particular type to a
         dictionary.  Return True if there was at least one.
@@ -3009,17 +3038,10 @@ f'''
 
         instances = []
 
-        for variable in variables_in_scope(self.spec, scope):
+        for variable in self._variables_in_scope(scope):
             variable_type = variable.type.type
-
-            # We treat unsigned and size_t as unsigned long as we don't
-            # generate a separate table for them.
-            if variable_type in (ArgumentType.UINT, ArgumentType.SIZE) and target_type is ArgumentType.ULONG:
-                variable_type = ArgumentType.ULONG
-
-            # Likewise we treat Py_hash_t and Py_ssize_t as long.
-            if variable_type in (ArgumentType.HASH, ArgumentType.SSIZE) and target_type is ArgumentType.LONG:
-                variable_type = ArgumentType.LONG
+            variable_type = self._INT_INSTANCE_TYPES.get(variable_type,
+                    variable_type)
 
             if variable_type is not target_type:
                 continue
@@ -3082,7 +3104,7 @@ def _name_cache_as_list(name_cache):
     # Create the list sorted first by descending name length and then
     # alphabetical order.
     for k in sorted(name_cache.keys(), reverse=True):
-        name_cache_list.extend(sorted(name_cache[k], key=lambda k: k.name))
+        name_cache_list.extend(sorted(name_cache[k], key=attrgetter('name')))
 
     # Set the offset into the string pool for every used name.
     offset = 0
@@ -3128,13 +3150,10 @@ def _write_instances_table(sf, scope, instances, declaration_template):
 
     declaration = declaration_template.format(dict_type=dict_type,
             suffix=suffix)
-    sf.write(f'\n\n{declaration} = {{\n')
-
-    for instance in instances:
-        entry = ', '.join(instance)
-        sf.write(f'    {{{entry}}},\n')
-
+    entries = ''.join(['    {' + ', '.join(instance) + '},\n'
+            for instance in instances])
     sentinals = ', '.join('0' * len(instances[0]))
-    sf.write(f'    {{{sentinals}}}\n}};\n')
+
+    sf.write(f'\n\n{declaration} = {{\n{entries}    {{{sentinals}}}\n}};\n')
 
     return True
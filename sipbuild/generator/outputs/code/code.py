@@ -157,6 +157,11 @@ def _module_code(backend, bindings, project, py_debug, buildable):
 class SourceFile:
     """ The encapsulation of a source file. """
 
+    # The size of the buffer used when writing a source file.  Generated code
+    # is written as many small fragments so a large buffer means that the
+    # underlying file is written to infrequently.
+    _BUFFER_SIZE = 1024 * 1024
+
     def __init__(self, source_name, description, module, project, generated):
         """ Initialise the object. """
 
@@ -185,7 +190,8 @@ class SourceFile:
     def open(self, source_name, project):
         """ Open a source file and make it current. """
 
-        self._f = open(source_name, 'w', encoding='UTF-8')
+        self._f = open(source_name, 'w', encoding='UTF-8',
+                buffering=self._BUFFER_SIZE)
 
         self._line_nr = 1
 
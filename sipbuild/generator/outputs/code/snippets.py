@@ -3,6 +3,8 @@
 # Copyright (c) 2026 Phil Thompson <phil@riverbankcomputing.com>
 
 
+from copy import copy
+
 from ....exceptions import UserException
 
 from ...python_slots import (is_hash_return_slot, is_inplace_number_slot,
@@ -550,7 +552,9 @@ f'''#ifndef _{module_name}API_H
     # Generate the SIP API.
     backend.g_sip_api(sf, module_name, state)
 
-    _module_api(backend, sf, bindings)
+    enums_by_scope = _get_enums_by_scope(spec)
+
+    _module_api(backend, sf, bindings, enums_by_scope)
 
     # TODO Move to the backend when everything else gets moved.
     if spec.target_abi < (14, 0):
@@ -565,7 +569,7 @@ extern sipExportedModuleDef sipModuleAPI_{module_name};
             sf.write(f'extern sipTypeDef *sipExportedTypes_{module_name}[];\n')
 
     for imported_module in module.all_imports:
-        _imported_module_api(backend, sf, imported_module)
+        _imported_module_api(backend, sf, imported_module, enums_by_scope)
 
     if pyqt5_supported(spec) or pyqt6_supported(spec):
         wrapper_type = backend.get_wrapper_type()
@@ -1202,6 +1206,23 @@ def _arg_parser(backend, sf, scope, py_signature, signature_nr, ctor=None,
     sf.write(f'        if ({parser_function}({args}))\n')
 
 
+# The string types.
+_STRING_ARG_TYPES = frozenset((ArgumentType.ASCII_STRING,
+    ArgumentType.LATIN1_STRING, ArgumentType.UTF8_STRING, ArgumentType.SSTRING,
+    ArgumentType.USTRING, ArgumentType.STRING, ArgumentType.WSTRING))
+
+# The types that are always handled as a pointer.
+_OBJECT_ARG_TYPES = frozenset((ArgumentType.CLASS, ArgumentType.MAPPED,
+    ArgumentType.STRUCT, ArgumentType.UNION, ArgumentType.VOID))
+
+# The types that are wrapped classes or mapped types.
+_WRAPPED_ARG_TYPES = frozenset((ArgumentType.CLASS, ArgumentType.MAPPED))
+
+# The encoded string types that may need to keep a reference to the Python
+# object.
+_UNICODE_KEEP_TYPES = frozenset((ArgumentType.ASCII_STRING,
+    ArgumentType.LATIN1_STRING, ArgumentType.UTF8_STRING))
+
 def _argument_variable(backend, sf, scope, arg, arg_nr):
     """ Generate the definition of an argument variable and any supporting
     variables.
@@ -1213,7 +1234,7 @@ def _argument_variable(backend, sf, scope, arg, arg_nr):
     supporting_default_value = ' = 0' if arg.default_value is not None else ''
     nr_derefs = len(arg.derefs)
 
-    if arg.is_in and arg.default_value is not None and arg.type in (ArgumentType.CLASS, ArgumentType.MAPPED) and (nr_derefs == 0 or arg.is_reference):
+    if arg.is_in and arg.default_value is not None and arg.type in _WRAPPED_ARG_TYPES and (nr_derefs == 0 or arg.is_reference):
         arg_cpp_type = fmt_argument_as_cpp_type(spec, arg,
                 scope=scope_iface_file)
 
@@ -1222,56 +1243,47 @@ def _argument_variable(backend, sf, scope, arg, arg_nr):
         expression = fmt_value_list_as_cpp_expression(spec, arg.default_value)
         sf.write(f'        {arg_cpp_type} {arg_name}def = {expression};\n')
 
-    # Adjust the type so we have the type that will really handle it.
-    saved_derefs = arg.derefs
-    saved_type = arg.type
-    saved_is_reference = arg.is_reference
-    saved_is_const = arg.is_const
-
+    # Adjust a copy of the argument so we have the type that will really
+    # handle it.
+    handler_arg = copy(arg)
     use_typename = True
 
-    if arg.type in (ArgumentType.ASCII_STRING, ArgumentType.LATIN1_STRING, ArgumentType.UTF8_STRING, ArgumentType.SSTRING, ArgumentType.USTRING, ArgumentType.STRING, ArgumentType.WSTRING):
+    if arg.type in _STRING_ARG_TYPES:
         if not arg.is_reference:
             if nr_derefs == 2:
-                arg.derefs = arg.derefs[0:1]
+                handler_arg.derefs = arg.derefs[0:1]
             elif nr_derefs == 1 and arg.is_out:
-                arg.derefs = []
+                handler_arg.derefs = []
 
-    elif arg.type in (ArgumentType.CLASS, ArgumentType.MAPPED, ArgumentType.STRUCT, ArgumentType.UNION, ArgumentType.VOID):
-        arg.derefs = [arg.derefs[0] if len(arg.derefs) != 0 else False]
+    elif arg.type in _OBJECT_ARG_TYPES:
+        handler_arg.derefs = [arg.derefs[0] if len(arg.derefs) != 0 else False]
 
     else:
-        arg.derefs = []
+        handler_arg.derefs = []
 
         if _arg_is_v13_typed_enum(spec, arg):
-            arg.type = ArgumentType.INT
+            handler_arg.type = ArgumentType.INT
             use_typename = False
 
     # Array sizes are always Py_ssize_t.
     if arg.array is ArrayArgument.ARRAY_SIZE:
-        arg.type = ArgumentType.SSIZE
+        handler_arg.type = ArgumentType.SSIZE
 
-    arg.is_reference = False
+    handler_arg.is_reference = False
 
-    if len(arg.derefs) == 0:
-        arg.is_const = False
+    if len(handler_arg.derefs) == 0:
+        handler_arg.is_const = False
 
-    modified_arg_cpp_type = fmt_argument_as_cpp_type(spec, arg,
+    handler_arg_cpp_type = fmt_argument_as_cpp_type(spec, handler_arg,
             scope=scope_iface_file, use_typename=use_typename)
 
-    sf.write(f'        {modified_arg_cpp_type} {arg_name}')
-
-    # Restore the argument to its original state.
-    arg.derefs = saved_derefs
-    arg.type = saved_type
-    arg.is_reference = saved_is_reference
-    arg.is_const = saved_is_const
+    sf.write(f'        {handler_arg_cpp_type} {arg_name}')
 
     # Generate any default value.
     if arg.is_in and arg.default_value is not None:
         sf.write(' = ')
 
-        if arg.type in (ArgumentType.CLASS, ArgumentType.MAPPED) and (nr_derefs == 0 or arg.is_reference):
+        if arg.type in _WRAPPED_ARG_TYPES and (nr_derefs == 0 or arg.is_reference):
             sf.write(f'&{arg_name}def')
         else:
             if _arg_is_v13_typed_enum(spec, arg):
@@ -1309,7 +1321,7 @@ def _argument_variable(backend, sf, scope, arg, arg_nr):
                 if type_needs_user_state(arg):
                     sf.write(f'        void *{arg_name}UserState = SIP_NULLPTR;\n')
 
-        elif arg.type in (ArgumentType.ASCII_STRING, ArgumentType.LATIN1_STRING, ArgumentType.UTF8_STRING):
+        elif arg.type in _UNICODE_KEEP_TYPES:
             if arg.key is None and nr_derefs == 1:
                 sf.write(f'        PyObject *{arg_name}Keep{supporting_default_value};\n')
 
@@ -1477,7 +1489,7 @@ f'''
 ''')
 
 
-def _class_api(backend, sf, klass):
+def _class_api(backend, sf, klass, enums_by_scope):
     """ Generate the C++ API for a class. """
 
     spec = backend.spec
@@ -1490,7 +1502,7 @@ def _class_api(backend, sf, klass):
     if klass.real_class is None and not klass.is_hidden_namespace:
         backend.g_class_api(sf, klass)
 
-    _enum_macros(backend, sf, scope=klass)
+    _enum_macros(backend, sf, enums_by_scope, scope=klass)
 
     if not klass.external and not klass.is_hidden_namespace:
         klass_name = iface_file.fq_cpp_name.as_word
@@ -1517,67 +1529,62 @@ def g_class_docstring(sf, spec, bindings, klass):
             if ctor.docstring.signature is not DocstringSignature.DISCARDED:
                 any_implied = True
 
-    # Generate the docstring.
-    if all_auto:
-        sf.write('\\1')
+    # Generate the docstring as a list of sections that will be separated by
+    # newlines.
+    sections = []
 
     if klass.docstring is not None and klass.docstring.signature is not DocstringSignature.PREPENDED:
-        sf.write(get_docstring_text(klass.docstring))
-        is_first = False
-    else:
-        is_first = True
+        sections.append(get_docstring_text(klass.docstring))
 
     if klass.docstring is None or klass.docstring.signature is not DocstringSignature.DISCARDED:
         for ctor in klass.ctors:
             if ctor.access_specifier is AccessSpecifier.PRIVATE:
                 continue
 
-            if not is_first:
-                sf.write(NEWLINE)
-
-                # Insert a blank line if any explicit docstring wants to
-                # include a signature.  This maintains compatibility with
-                # previous versions.
-                if any_implied:
-                    sf.write(NEWLINE)
+            # Insert a blank line if any explicit docstring wants to include a
+            # signature.  This maintains compatibility with previous versions.
+            if sections and any_implied:
+                sections.append('')
 
             if ctor.docstring is not None:
-                if ctor.docstring.signature is DocstringSignature.PREPENDED:
-                    _ctor_auto_docstring(sf, spec, bindings, klass, ctor)
-                    sf.write(NEWLINE)
+                section = get_docstring_text(ctor.docstring)
 
-                sf.write(get_docstring_text(ctor.docstring))
-
-                if ctor.docstring.signature is DocstringSignature.APPENDED:
-                    sf.write(NEWLINE)
-                    _ctor_auto_docstring(sf, spec, bindings, klass, ctor)
+                if ctor.docstring.signature is DocstringSignature.PREPENDED:
+                    auto_docstring = _ctor_auto_docstring(spec, bindings,
+                            klass, ctor)
+                    section = auto_docstring + NEWLINE + section
+                elif ctor.docstring.signature is DocstringSignature.APPENDED:
+                    auto_docstring = _ctor_auto_docstring(spec, bindings,
+                            klass, ctor)
+                    section = section + NEWLINE + auto_docstring
             elif all_auto or any_implied:
-                _ctor_auto_docstring(sf, spec, bindings, klass, ctor)
+                section = _ctor_auto_docstring(spec, bindings, klass, ctor)
+            else:
+                section = ''
 
-            is_first = False
+            sections.append(section)
 
     if klass.docstring is not None and klass.docstring.signature is DocstringSignature.PREPENDED:
-        if not is_first:
-            sf.write(NEWLINE)
-            sf.write(NEWLINE)
-
-        sf.write(get_docstring_text(klass.docstring))
+        if sections:
+            sections.append('')
 
+        sections.append(get_docstring_text(klass.docstring))
 
-def _ctor_auto_docstring(sf, spec, bindings, klass, ctor):
-    """ Generate the automatic docstring for a ctor. """
+    auto_marker = '\\1' if all_auto else ''
+    sf.write(auto_marker + NEWLINE.join(sections))
 
-    if bindings.docstrings:
-        g_ctor_type_hint(sf, spec, bindings, klass, ctor)
 
+def _ctor_auto_docstring(spec, bindings, klass, ctor):
+    """ Return the automatic docstring for a ctor. """
 
-def g_ctor_type_hint(sf, spec, bindings, klass, ctor):
-    """ Generate the type hint for a ctor. """
+    if not bindings.docstrings:
+        return ''
 
     py_name = fmt_scoped_py_name(klass.scope, klass.py_name.name)
     signature = fmt_signature_as_type_hint(spec, ctor.py_signature,
             need_self=False, exclude_result=True)
-    sf.write(py_name + signature)
+
+    return py_name + signature
 
 
 def _ctor_call(backend, sf, bindings, klass, ctor, error_flag, old_error_flag):
@@ -1815,22 +1822,14 @@ def _delete_temporaries(backend, sf, py_signature):
                 sf.write(');\n')
 
 
-def _enum_macros(backend, sf, scope=None, imported_module=None):
+def _enum_macros(backend, sf, enums_by_scope, scope=None,
+        imported_module=None):
     """ Generate the type macros for enums. """
 
     spec = backend.spec
+    macros = []
 
-    for enum in spec.enums:
-        if enum.fq_cpp_name is None:
-            continue
-
-        # Continue unless the scopes match.
-        if scope is not None:
-            if enum.scope is not scope:
-                continue
-        elif enum.scope is not None:
-            continue
-
+    for enum in enums_by_scope.get(id(scope), ()):
         value = None
 
         if imported_module is None:
@@ -1840,7 +1839,10 @@ def _enum_macros(backend, sf, scope=None, imported_module=None):
             value = backend.get_enum_ref_value(enum)
 
         if value is not None:
-            sf.write(f'\n#define {backend.get_type_ref(enum)} {value}\n')
+            macros.append(f'\n#define {backend.get_type_ref(enum)} {value}\n')
+
+    if len(macros) != 0:
+        sf.write(''.join(macros))
 
 
 def _gc_ellipsis(sf, signature):
@@ -1852,6 +1854,18 @@ def _gc_ellipsis(sf, signature):
         sf.write(f'\n            Py_DECREF(a{last});\n')
 
 
+def _get_enums_by_scope(spec):
+    """ Return a dict of the named enums keyed by the id() of their scope. """
+
+    enums_by_scope = {}
+
+    for enum in spec.enums:
+        if enum.fq_cpp_name is not None:
+            enums_by_scope.setdefault(id(enum.scope), []).append(enum)
+
+    return enums_by_scope
+
+
 def _get_method_table(klass):
     """ Return a sorted list of relevant methods (either lazy or non-lazy) for
     a class.
@@ -1865,39 +1879,41 @@ def _get_method_table(klass):
     # entries.
 
     members = []
+    has_shadow = klass.has_shadow
 
     for visible_member in klass.visible_members:
-        if visible_member.member.py_slot is not None:
+        member = visible_member.member
+
+        if member.py_slot is not None:
             continue
 
-        need_member = False
+        scope = visible_member.scope
 
-        for overload in visible_member.scope.overloads:
+        for overload in scope.overloads:
             # Skip protected methods if we don't have the means to handle them.
-            if overload.access_specifier is AccessSpecifier.PROTECTED and not klass.has_shadow:
+            if overload.access_specifier is AccessSpecifier.PROTECTED and not has_shadow:
                 continue
 
-            if not skip_overload(overload, visible_member.member, klass, visible_member.scope):
-                need_member = True
-
-        if need_member:
-            members.append(visible_member.member)
+            # One overload is enough.
+            if not skip_overload(overload, member, klass, scope):
+                members.append(member)
+                break
 
     return get_function_table(members)
 
 
+# The sub-format flags for the transfers that apply to all types.
+_TRANSFER_FLAGS = {
+    Transfer.TRANSFER: 0x02,
+    Transfer.TRANSFER_BACK: 0x04,
+}
+
 def _get_subformat_char(arg):
     """ Return the sub-format character for an argument. """
 
-    flags = 0
-
-    if arg.transfer is Transfer.TRANSFER:
-        flags |= 0x02
+    flags = _TRANSFER_FLAGS.get(arg.transfer, 0)
 
-    if arg.transfer is Transfer.TRANSFER_BACK:
-        flags |= 0x04
-
-    if arg.type in (ArgumentType.CLASS, ArgumentType.MAPPED):
+    if arg.type in _WRAPPED_ARG_TYPES:
         if len(arg.derefs) == 0 or arg.disallow_none:
             flags |= 0x01
 
@@ -1995,8 +2011,10 @@ def g_overload_type_hint(sf, spec, overload, is_method=True):
     sf.write(overload.common.py_name.name + signature)
 
 
-def _pyqt_emitters(backend, sf, klass):
-    """ Generate the PyQt emitters for a class. """
+def _pyqt_emitters(backend, sf, klass, optional_signals):
+    """ Generate the PyQt emitters for a class given the signals that have
+    optional arguments.
+    """
 
     spec = backend.spec
     klass_name = klass.iface_file.fq_cpp_name.as_word
@@ -2007,20 +2025,24 @@ def _pyqt_emitters(backend, sf, klass):
         in_emitter = False
         signature_nr = 0
 
-        for overload in klass.overloads:
-            if not (overload.common is member and overload.pyqt_method_specifier is PyQtMethodSpecifier.SIGNAL and _has_optional_args(overload)):
+        for overload in optional_signals:
+            if overload.common is not member:
                 continue
 
             if not in_emitter:
                 in_emitter = True
 
-                sf.write('\n\n')
+                emitter_name = f'emit_{klass_name}_{overload.cpp_name}'
 
-                if not spec.c_bindings:
-                    sf.write(f'extern "C" {{static int emit_{klass_name}_{overload.cpp_name}(void *, PyObject *);}}\n\n')
+                if spec.c_bindings:
+                    decl_s = ''
+                else:
+                    decl_s = f'extern "C" {{static int {emitter_name}(void *, PyObject *);}}\n\n'
 
                 sf.write(
-f'''static int emit_{klass_name}_{overload.cpp_name}(void *sipCppV, PyObject *sipArgs)
+f'''
+
+{decl_s}static int {emitter_name}(void *sipCppV, PyObject *sipArgs)
 {{
     PyObject *sipParseErr = SIP_NULLPTR;
     {scope_s} *sipCpp = reinterpret_cast<{scope_s} *>(sipCppV);
@@ -2067,33 +2089,39 @@ f'''
 ''')
 
 
-def _pyqt_signal_table_entry(sf, spec, bindings, klass, signal, member_nr):
+def _pyqt_signal_table_entry(sf, spec, bindings, klass, signal, member_nr,
+        has_emitter):
     """ Generate an entry in the PyQt signal table. """
 
-    klass_name = klass.iface_file.fq_cpp_name.as_word
+    iface_file = klass.iface_file
+    klass_name = iface_file.fq_cpp_name.as_word
+    signal_args = signal.cpp_signature.args
 
     stripped = False
-    signature_state = {}
 
     args = []
+    unstripped_args = []
 
-    for arg in signal.cpp_signature.args:
-        # Do some signal argument normalisation so that Qt doesn't have to.
+    for arg in signal_args:
+        # Do some signal argument normalisation (of a copy) so that Qt doesn't
+        # have to.
         if arg.is_const and (arg.is_reference or len(arg.derefs) == 0):
-            signature_state[arg] = arg.is_reference
-
+            arg = copy(arg)
             arg.is_const = False
             arg.is_reference = False
 
+        unstripped_arg = fmt_argument_as_cpp_type(spec, arg, scope=iface_file,
+                strip=STRIP_GLOBAL)
+
         if arg.scopes_stripped != 0:
-            strip = arg.scopes_stripped
+            args.append(
+                    fmt_argument_as_cpp_type(spec, arg, scope=iface_file,
+                            strip=arg.scopes_stripped))
             stripped = True
         else:
-            strip = STRIP_GLOBAL
+            args.append(unstripped_arg)
 
-        args.append(
-                fmt_argument_as_cpp_type(spec, arg, scope=klass.iface_file,
-                        strip=strip))
+        unstripped_args.append(unstripped_arg)
 
     # Note the lack of a separating space.
     args = ','.join(args)
@@ -2101,27 +2129,15 @@ def _pyqt_signal_table_entry(sf, spec, bindings, klass, signal, member_nr):
     sf.write(f'    {{"{signal.cpp_name}({args})')
 
     # If a scope was stripped then append an unstripped version which can
-        # be parsed by PyQt.
+    # be parsed by PyQt.
     if stripped:
-        args = []
-
-        for arg in signal.cpp_signature.args:
-            args.append(
-                    fmt_argument_as_cpp_type(spec, arg,
-                            scope=klass.iface_file, strip=STRIP_GLOBAL))
-
         # Note the lack of a separating space.
-        args = ','.join(args)
+        unstripped_args = ','.join(unstripped_args)
 
-        sf.write(f'|({args})')
+        sf.write(f'|({unstripped_args})')
 
     sf.write('", ')
 
-    # Restore the signature state.
-    for arg, is_reference in signature_state.items():
-        arg.is_const = True
-        arg.is_reference = is_reference
-
     if bindings.docstrings:
         sf.write('"')
 
@@ -2145,7 +2161,7 @@ def _pyqt_signal_table_entry(sf, spec, bindings, klass, signal, member_nr):
 
     sf.write(f'&methods_{klass_name}[{member_nr}], ' if member_nr >= 0 else 'SIP_NULLPTR, ')
 
-    sf.write(f'emit_{klass_name}_{signal.cpp_name}' if _has_optional_args(signal) else 'SIP_NULLPTR')
+    sf.write(f'emit_{klass_name}_{signal.cpp_name}' if has_emitter else 'SIP_NULLPTR')
 
     sf.write('},\n')
 
@@ -2162,26 +2178,45 @@ def _pyqt_signals_table(backend, sf, bindings, klass):
     spec = backend.spec
     is_signals = False
 
+    # Index the signals by the member they belong to and note the members
+    # that also have non-signal overloads.  Only the signals with optional
+    # arguments need an emitter.
+    member_signals = {}
+    has_non_signals = set()
+    optional_signals = []
+
+    for overload in klass.overloads:
+        member_id = id(overload.common)
+
+        if overload.pyqt_method_specifier is PyQtMethodSpecifier.SIGNAL:
+            has_emitter = _has_optional_args(overload)
+
+            member_signals.setdefault(member_id, []).append(
+                    (overload, has_emitter))
+
+            if has_emitter:
+                optional_signals.append(overload)
+        else:
+            has_non_signals.add(member_id)
+
+    # QObject sub-classes don't necessarily define any signals.
+    if len(member_signals) == 0:
+        return False
+
     # The signals must be grouped by name.
     for member in klass.members:
-        member_nr = member.member_nr
-
-        for overload in klass.overloads:
-            if overload.common is not member or overload.pyqt_method_specifier is not PyQtMethodSpecifier.SIGNAL:
-                continue
+        signals = member_signals.get(id(member))
+        if signals is None:
+            continue
 
-            if member_nr >= 0:
-                # See if there is a non-signal overload.
-                for non_sig in klass.overloads:
-                    if non_sig is not overload and non_sig.common is member and non_sig.pyqt_method_specifier is not PyQtMethodSpecifier.SIGNAL:
-                        break
-                else:
-                    member_nr = -1
+        # Only the first signal refers to any non-signal overloads.
+        member_nr = member.member_nr if id(member) in has_non_signals else -1
 
+        for overload, has_emitter in signals:
             if not is_signals:
                 is_signals = True
 
-                _pyqt_emitters(backend, sf, klass)
+                _pyqt_emitters(backend, sf, klass, optional_signals)
 
                 pyqt_version = '5' if pyqt5_supported(spec) else '6'
                 sf.write(
@@ -2195,7 +2230,7 @@ static const pyqt{pyqt_version}QtSignal signals_{klass.iface_file.fq_cpp_name.as
             # We only include the version with all arguments and provide an
             # emitter function which handles the optional arguments.
             _pyqt_signal_table_entry(sf, spec, bindings, klass, overload,
-                    member_nr)
+                    member_nr, has_emitter)
 
             member_nr = -1
 
@@ -4464,7 +4499,7 @@ def _used_includes(sf, used):
         sf.write_code(iface_file.type_header_code)
 
 
-def _module_api(backend, sf, bindings):
+def _module_api(backend, sf, bindings, enums_by_scope):
     """ Generate the API details for a module. """
 
     spec = backend.spec
@@ -4473,7 +4508,7 @@ def _module_api(backend, sf, bindings):
 
     for klass in spec.classes:
         if klass.iface_file.module is module:
-            _class_api(backend, sf, klass)
+            _class_api(backend, sf, klass, enums_by_scope)
 
             if klass.export_derived_locally:
                 sf.write_code(klass.iface_file.type_header_code)
@@ -4488,7 +4523,7 @@ def _module_api(backend, sf, bindings):
             backend.g_mapped_type_api(sf, mapped_type)
 
     backend.g_exceptions_decls(sf)
-    _enum_macros(backend, sf)
+    _enum_macros(backend, sf, enums_by_scope)
 
     wrapper_type = backend.get_wrapper_type()
 
@@ -4497,7 +4532,7 @@ def _module_api(backend, sf, bindings):
             sf.write(f'\nvoid sipVEH_{module_name}_{virtual_error_handler.name}({wrapper_type}, sip_gilstate_t);\n')
 
 
-def _imported_module_api(backend, sf, imported_module):
+def _imported_module_api(backend, sf, imported_module, enums_by_scope):
     """ Generate the API details for an imported module. """
 
     spec = backend.spec
@@ -4510,7 +4545,7 @@ def _imported_module_api(backend, sf, imported_module):
             if iface_file.needed:
                 backend.g_class_api(sf, klass)
 
-            _enum_macros(backend, sf, scope=klass,
+            _enum_macros(backend, sf, enums_by_scope, scope=klass,
                     imported_module=imported_module)
 
     for mapped_type in spec.mapped_types:
@@ -4520,7 +4555,7 @@ def _imported_module_api(backend, sf, imported_module):
             if iface_file.needed:
                 backend.g_mapped_type_api(sf, mapped_type)
 
-            _enum_macros(backend, sf, scope=mapped_type,
+            _enum_macros(backend, sf, enums_by_scope, scope=mapped_type,
                     imported_module=imported_module)
 
     for exception in spec.exceptions:
@@ -4532,7 +4567,8 @@ def _imported_module_api(backend, sf, imported_module):
             # reference to the Python object.
             sf.write(f'\n#define sipException_{iface_file.fq_cpp_name.as_word} sipImportedExceptions_{module_name}_{iface_file.module.py_name}[{exception.exception_nr}].iexc_object\n')
 
-    _enum_macros(backend, sf, imported_module=imported_module)
+    _enum_macros(backend, sf, enums_by_scope,
+            imported_module=imported_module)
 
     backend.g_imported_module_decls(sf, imported_module)
 
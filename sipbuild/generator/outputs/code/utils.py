@@ -3,6 +3,9 @@
 # Copyright (c) 2026 Phil Thompson <phil@riverbankcomputing.com>
 
 
+from copy import copy
+from operator import attrgetter
+
 from ...specification import (AccessSpecifier, ArgumentType, CodeBlock,
         GILAction, IfaceFileType, MappedType, PyQtMethodSpecifier,
         WrappedClass)
@@ -79,6 +82,18 @@ def get_convert_to_type_code(type):
     return None
 
 
+# The escapes of those of the first 256 characters of a docstring that can't be
+# used as they are.  Any other non-printable characters are rare and are
+# handled separately.
+_DOCSTRING_ESCAPES = {cp: f'\\{cp:03o}' for cp in range(256)
+        if not chr(cp).isprintable()}
+
+# Let the compiler concatanate lines.
+_DOCSTRING_ESCAPES[ord('\n')] = '\\n"\n"'
+
+_DOCSTRING_ESCAPES[ord('\\')] = '\\\\'
+_DOCSTRING_ESCAPES[ord('"')] = '\\"'
+
 def get_docstring_text(docstring):
     """ Return the text of a docstring. """
 
@@ -88,21 +103,17 @@ def get_docstring_text(docstring):
     if text.endswith('\n'):
         text = text[:-1]
 
-    s = ''
-
-    for ch in text:
-        if ch == '\n':
-            # Let the compiler concatanate lines.
-            s += '\\n"\n"'
-        elif ch in r'\"':
-            s += '\\'
-            s += ch
-        elif ch.isprintable():
-            s += ch
-        else:
-            s += f'\\{ord(ch):03o}'
+    escapes = _DOCSTRING_ESCAPES
 
-    return s
+    # Handle any non-printable characters that aren't in the table.
+    if not text.isascii():
+        extra_escapes = {ord(ch): f'\\{ord(ch):03o}' for ch in set(text)
+                if ord(ch) not in escapes and not ch.isprintable()}
+
+        if len(extra_escapes) != 0:
+            escapes = {**escapes, **extra_escapes}
+
+    return text.translate(escapes)
 
 
 def get_encoded_type(module, klass, last=False):
@@ -165,7 +176,7 @@ def get_enum_member(spec, enum_member):
 def get_function_table(members):
     """ Return a sorted list of relevant functions for a namespace. """
 
-    return sorted(members, key=lambda m: m.py_name.name)
+    return sorted(members, key=attrgetter('py_name.name'))
 
 
 def get_mapped_type_flags(mapped_type):
@@ -184,30 +195,43 @@ def get_mapped_type_flags(mapped_type):
     return '|'.join(flags)
 
 
+def get_members_with_docstrings(bindings, overloads):
+    """ Return the set of the ids of the functions/methods that have a
+    docstring.  This is equivalent to calling has_method_docstring() for each
+    of them but only makes one pass through the overloads.
+    """
+
+    members = set()
+
+    for overload in overloads:
+        if overload.access_specifier is AccessSpecifier.PRIVATE or overload.pyqt_method_specifier is PyQtMethodSpecifier.SIGNAL:
+            continue
+
+        member = overload.common
+
+        if overload.docstring is not None or (bindings.docstrings and not member.no_arg_parser):
+            members.add(id(member))
+
+    return members
+
+
 def get_named_value_decl(spec, scope, type, name):
     """ Return the declaration of a named variable to hold a C++ value. """
 
-    saved_derefs = type.derefs
-    saved_is_const = type.is_const
-    saved_is_reference = type.is_reference
+    # Adjust a copy of the type so that it can hold the value.
+    value_type = copy(type)
 
     if len(type.derefs) == 0:
         if type.type in (ArgumentType.CLASS, ArgumentType.MAPPED):
-            type.derefs = [False]
+            value_type.derefs = [False]
         else:
-            type.is_const = False
+            value_type.is_const = False
 
-    type.is_reference = False
+    value_type.is_reference = False
 
-    named_value_decl = fmt_argument_as_cpp_type(spec, type, name=name,
+    return fmt_argument_as_cpp_type(spec, value_type, name=name,
             scope=scope.iface_file if isinstance(scope, (WrappedClass, MappedType)) else None)
 
-    type.derefs = saved_derefs
-    type.is_const = saved_is_const
-    type.is_reference = saved_is_reference
-
-    return named_value_decl
-
 
 def get_normalised_cached_name(cached_name):
     """ Return the normalised form of a cached name. """
@@ -439,11 +463,9 @@ def type_needs_user_state(type):
 
 
 def variables_in_scope(spec, scope, check_handler=True):
-    """ An iterator over the variables in a scope. """
+    """ Return the list of variables in a scope. """
 
-    for variable in spec.variables:
-        if py_scope(variable.scope) is scope and variable.module is spec.module:
-            if check_handler and variable.needs_handler:
-                continue
+    module = spec.module
 
-            yield variable
+    return [variable for variable in spec.variables
+            if py_scope(variable.scope) is scope and variable.module is module and not (check_handler and variable.needs_handler)]
@@ -4,6 +4,7 @@
 
 
 from functools import partial
+from operator import attrgetter
 import os
 
 from ...exceptions import deprecated, UserException
@@ -1456,7 +1457,7 @@ class ParserManager:
         self.spec.c_bindings = bool(self.c_bindings)
 
         self.spec.typedefs.sort(key=lambda k: k.fq_cpp_name)
-        self.spec.variables.sort(key=lambda k: k.py_name.name)
+        self.spec.variables.sort(key=attrgetter('py_name.name'))
 
         # Remove all template classes and anything they contain.
         template_classes = [k for _, k in self.class_templates]